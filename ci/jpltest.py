@@ -21,8 +21,11 @@ def run_testpo(spk, testpo_file):
     while next(lines).strip() != 'EOT':
         continue
 
-    skips = 0
-    successes = 0
+    rows = np.loadtxt(lines, dtype=[
+        ('de', 'U8'), ('date', 'U10'), ('jed', 'f8'), ('target', 'i4'),
+        ('center', 'i4'), ('number', 'i4'), ('value', 'f8'),
+    ])
+
     targets = set([segment.target for segment in spk.segments])
 
     # Old codes, special-cased in _position():
@@ -30,38 +33,52 @@ def run_testpo(spk, testpo_file):
     targets.add(12)
     targets.add(13)
 
-    for line in lines:
-        de, date, jed, target, center, number, value = [f(v) for f, v
-            in zip((str, str, float, int, int, int, float), line.split())]
+    targets = list(targets)
+    known = np.isin(rows['target'], targets) & np.isin(rows['center'], targets)
+    skipped = rows[~known]
+    assert np.isin(skipped['target'], [14, 15]).all()
+    assert (skipped['center'] == 0).all()
+    skips = len(skipped)
+    rows = rows[known]
+
+    # Compute each body just once, at every date in the file, and
+    # then check the rows for each target and center together.
+
+    jed = rows['jed']
+    bodies = np.union1d(rows['target'], rows['center']).tolist()
+    positions = dict((body, _position(spk, jed, body)) for body in bodies)
+
+    successes = 0
+    pairs = np.unique(rows[['target', 'center']])
 
-        if (target not in targets) or (center not in targets):
-            assert target == 14 or target == 15
-            assert center == 0
-            skips += 1
-            continue
+    for target, center in pairs.tolist():
+        mask = (rows['target'] == target) & (rows['center'] == center)
+        group = rows[mask]
 
         if 14 <= target <= 15:
-            r = _position(spk, jed, target)
+            r = positions[target][:,mask]
         else:
-            tpos = _position(spk, jed, target)
-            cpos = _position(spk, jed, center)
+            tpos = positions[target][:,mask]
+            cpos = positions[center][:,mask]
             r = (tpos - cpos) / AU
 
-        delta = r[number - 1] - value
-        # if (target == 15 and number == 3):
-        #     delta = delta / (0.23 * (jed - 2451545.0))
-        # elif (target == 15 and number == 6):
-        #     delta = delta * 0.01 / (1.0 + (jed - 2451545.0) / 365.25)
+        ours = r[group['number'] - 1, np.arange(len(group))]
+        delta = ours - group['value']
 
-        if abs(delta) >= epsilon:
+        failures = np.flatnonzero(abs(delta) >= epsilon)
+        if len(failures):
+            i = failures[0]
+            row = group[i]
+            number = row['number']
             print('%s %s %s->%s field %d (%s)'
-                  % (date, jed, center, target, number, field_names[number]))
-            print('  JPL result: %.15f' % value)
-            print('  Our result: %.15f' % r[number - 1])
-            print('    ERROR: difference = %s' % (delta,))
+                  % (row['date'], row['jed'], center, target, number,
+                     field_names[number]))
+            print('  JPL result: %.15f' % row['value'])
+            print('  Our result: %.15f' % ours[i])
+            print('    ERROR: difference = %s' % (delta[i],))
             exit(1)
 
-        successes += 1
+        successes += len(group)
 
     print('  {0} tests successful, {1} skipped'.format(successes, skips))
 
@@ -82,7 +99,7 @@ def _position(spk, jed, target):
     elif target == 11:
         p, v = spk[0,10].compute_and_differentiate(jed)
     elif target == 12:
-        return np.zeros((6,))  # solar system barycenter is the origin
+        return np.zeros((6,) + np.shape(jed))  # barycenter is the origin
     elif target == 13:
         p, v = spk[0,3].compute_and_differentiate(jed)
     else:
@@ -28,8 +28,9 @@ class Ephemeris(object):
             for name in os.listdir(self.dirpath)
             if not name.startswith('constants') and name.endswith('.npy')
             ))
-        path = self.path('constants.npy')
-        self.__dict__.update((k.decode('ascii'), v) for k, v in np.load(path))
+        constants = np.load(self.path('constants.npy'))
+        names = constants['name'].astype(str).tolist()
+        self.__dict__.update(zip(names, constants['value'].tolist()))
         self.earth_share = 1.0 / (1.0 + self.EMRAT)
         self.moon_share = self.EMRAT / (1.0 + self.EMRAT)
         self.sets = {}
@@ -89,9 +90,7 @@ class Ephemeris(object):
 
         """
         bundle = self.compute_bundle(name, tdb, tdb2)
-        position = self.position_from_bundle(bundle)
-        velocity = self.velocity_from_bundle(bundle)
-        return position, velocity
+        return self._position_and_velocity_from_bundle(bundle)
 
     def compute(self, name, tdb):
         """[DEPRECATED] Legacy routine that concatenates position and velocity vectors.
@@ -105,8 +104,7 @@ class Ephemeris(object):
 
         """
         bundle = self.compute_bundle(name, tdb, 0.0)
-        position = self.position_from_bundle(bundle)
-        velocity = self.velocity_from_bundle(bundle)
+        position, velocity = self._position_and_velocity_from_bundle(bundle)
         return np.concatenate((position, velocity))
 
     def compute_bundle(self, name, tdb, tdb2=0.0):
@@ -120,6 +118,11 @@ class Ephemeris(object):
         package-level documentation for details; most users will simply
         call `position()` or `position_and_velocity()` instead.
 
+        The tuple is ``(coefficients, days_per_set, t1, twot1)``, where
+        ``t1`` is the Chebyshev time from -1 to +1 across each set of
+        coefficients and ``twot1`` is twice that.  Older versions put a
+        table of Chebyshev polynomials where ``t1`` now sits.
+
         The barycentric dynamical time `tdb` argument should be a float.
         If there are many dates you want computed, then make `tdb` an
         array, which is more efficient than calling this method multiple
@@ -147,50 +150,68 @@ class Ephemeris(object):
         # to keep precision, first subtract, then add
         index, offset = divmod((tdb - jalpha) + tdb2, days_per_set)
         index = index.astype(int)
+        low = index.min() if index.size else 0
+        high = index.max() if index.size else 0
 
-        if (index < 0).any() or (number_of_sets < index).any():
+        if low < 0 or number_of_sets < high:
             raise DateError('ephemeris %s only covers dates %.1f through %.1f'
                             % (self.name, jalpha, jomega))
 
-        omegas = (index == number_of_sets)
-        index[omegas] -= 1
-        offset[omegas] += days_per_set
+        if high == number_of_sets:
+            omegas = (index == number_of_sets)
+            index[omegas] -= 1
+            offset[omegas] += days_per_set
 
         coefficients = np.rollaxis(coefficient_sets[index], 1)
 
-        # Chebyshev recurrence:
-
-        T = np.empty((coefficient_count, len(index)))
-        T[0] = 1.0
-        T[1] = t1 = 2.0 * offset / days_per_set - 1.0
+        t1 = offset * (2.0 / days_per_set) - 1.0
         twot1 = t1 + t1
-        for i in range(2, coefficient_count):
-            T[i] = twot1 * T[i-1] - T[i-2]
 
-        bundle = coefficients, days_per_set, T, twot1
+        bundle = coefficients, days_per_set, t1, twot1
         return bundle
 
     def position_from_bundle(self, bundle):
         """[DEPRECATED] Return position, given the `coefficient_bundle()` return value."""
 
-        coefficients, days_per_set, T, twot1 = bundle
-        return (T.T * coefficients).sum(axis=2)
+        coefficients, days_per_set, t1, twot1 = bundle
+        coefficient_count = coefficients.shape[2]
+
+        # Clenshaw's recurrence, which needs no table of polynomials:
+
+        b1 = b2 = 0.0
+        for i in range(coefficient_count - 1, 0, -1):
+            b1, b2 = coefficients[:,:,i] + (twot1 * b1 - b2), b1
+        return coefficients[:,:,0] + (t1 * b1 - b2)
 
     def velocity_from_bundle(self, bundle):
         """[DEPRECATED] Return velocity, given the `coefficient_bundle()` return value."""
 
-        coefficients, days_per_set, T, twot1 = bundle
+        coefficients, days_per_set, t1, twot1 = bundle
+        coefficient_count = coefficients.shape[2]
+
+        # The derivative of T[i] is i times the Chebyshev polynomial of
+        # the second kind U[i-1], whose series Clenshaw's recurrence can
+        # sum on its own, without recomputing the position:
+
+        b1 = b2 = 0.0
+        for i in range(coefficient_count - 1, 0, -1):
+            b1, b2 = i * coefficients[:,:,i] + (twot1 * b1 - b2), b1
+        return b1 * (2.0 / days_per_set)
+
+    def _position_and_velocity_from_bundle(self, bundle):
+        """Return position and velocity from a single pass over the bundle."""
+
+        coefficients, days_per_set, t1, twot1 = bundle
         coefficient_count = coefficients.shape[2]
 
-        # Chebyshev derivative:
+        # Clenshaw's recurrence, carrying along its derivative:
 
-        dT = np.empty_like(T)
-        dT[0] = 0.0
-        dT[1] = 1.0
-        dT[2] = twot1 + twot1
-        for i in range(3, coefficient_count):
-            dT[i] = twot1 * dT[i-1] - dT[i-2] + T[i-1] + T[i-1]
-        dT *= 2.0
-        dT /= days_per_set
+        b1 = b2 = d1 = d2 = 0.0
+        for i in range(coefficient_count - 1, 0, -1):
+            d1, d2 = 2.0 * b1 + (twot1 * d1 - d2), d1
+            b1, b2 = coefficients[:,:,i] + (twot1 * b1 - b2), b1
 
-        return (dT.T * coefficients).sum(axis=2)
+        position = coefficients[:,:,0] + (t1 * b1 - b2)
+        rates = b1 + (t1 * d1 - d2)
+        rates *= 2.0 / days_per_set
+        return position, rates
@@ -7,6 +7,7 @@ from numpy import array, rollaxis
 from .calendar import compute_calendar_date
 from .daf import DAF
 from .names import target_names
+from .spk import _blockwise, _chebyshev, _chebyshev_and_derivative
 
 T0 = 2451545.0
 S_PER_DAY = 86400.0
@@ -136,54 +137,43 @@ class Segment(object):
         coefficient_count, component_count, n = coefficients.shape
 
         # Subtracting init before adding tdb2 affords greater precision.
-        seconds = (tdb - T0) * S_PER_DAY - init + tdb2 * S_PER_DAY
+        seconds = tdb - T0
+        seconds *= S_PER_DAY
+        seconds -= init
+        seconds = seconds + tdb2 * S_PER_DAY
         index, offset = divmod(seconds, intlen)
         index = index.astype(int)
+        low = index.min() if index.size else 0
+        high = index.max() if index.size else 0
 
-        if (index < 0).any() or (index > n).any():
+        if low < 0 or high > n:
             raise ValueError(
                 'segment only covers dates %d-%02d-%02d through %d-%02d-%02d'
                 % (compute_calendar_date(self.initial_jd + 0.5) +
                    compute_calendar_date(self.final_jd + 0.5))
             )
 
-        omegas = (index == n)
-        index[omegas] -= 1
-        offset[omegas] += intlen
+        if high == n:
+            omegas = (index == n)
+            index[omegas] -= 1
+            offset[omegas] += intlen
 
-        coefficients = coefficients[:,:,index]
+        # Chebyshev polynomial, and its derivative if requested.
 
-        # Chebyshev polynomial.
-
-        s = 2.0 * offset / intlen - 1.0
-        s2 = 2.0 * s
-
-        w0 = w1 = dw0 = dw1 = 0.0
-
-        for coefficient in coefficients[:-1]:
-            w2 = w1
-            w1 = w0
-            w0 = coefficient + (s2 * w1 - w2)
-            if derivative:  # TODO: defer to a second loop
-                dw2 = dw1
-                dw1 = dw0
-                dw0 = 2.0 * w1 + dw1 * s2 - dw2
-
-        components = coefficients[-1] + (s * w0 - w1)
-
-        if scalar:
-            components = components[:,0]
+        s = offset * (2.0 / intlen) - 1.0
 
         if not derivative:
+            components = _blockwise(_chebyshev, coefficients, index, s)
+            if scalar:
+                components = components[:,0]
             return components
 
-        # Chebyshev differentiation.
-
-        rates = w0 + s * dw0 - dw1
-        rates /= intlen
-        rates *= 2.0
+        components, rates = _blockwise(
+            _chebyshev_and_derivative, coefficients, index, s)
+        rates *= 2.0 / intlen
 
         if scalar:
+            components = components[:,0]
             rates = rates[:,0]
 
         return components, rates
@@ -3,7 +3,7 @@
 http://naif.jpl.nasa.gov/pub/naif/toolkit_docs/FORTRAN/req/spk.html
 
 """
-from numpy import array, interp, rollaxis
+from numpy import array, asarray, empty, flatnonzero, rollaxis, searchsorted
 from .calendar import compute_calendar_date
 from .daf import DAF
 from .descriptorlib import reify
@@ -12,6 +12,8 @@ from .names import target_names
 
 T0 = 2451545.0
 S_PER_DAY = 86400.0
+BLOCK_SIZE = 4096  # dates to evaluate at once; see _blockwise()
+RUN_LENGTH = 512  # dates per interval worth skipping the gather for
 
 def jd(seconds):
     """Convert a number of seconds since J2000 to a Julian Date."""
@@ -154,12 +156,21 @@ class Segment(BaseSegment):
 
     def compute(self, tdb, tdb2=0.0):
         """Compute the component values for the time `tdb` plus `tdb2`."""
-        for position in self.generate(tdb, tdb2):
-            return position
+        scalar, index, s = self._locate(tdb, tdb2)
+        init, intlen, coefficients = self._data
+        evaluate = _scalar if scalar else _blockwise
+        return evaluate(_chebyshev, coefficients, index, s)
 
     def compute_and_differentiate(self, tdb, tdb2=0.0):
         """Compute components and differentials for time `tdb` plus `tdb2`."""
-        return tuple(self.generate(tdb, tdb2))
+        scalar, index, s = self._locate(tdb, tdb2)
+        init, intlen, coefficients = self._data
+        evaluate = _scalar if scalar else _blockwise
+
+        components, rates = evaluate(
+            _chebyshev_and_derivative, coefficients, index, s)
+        rates *= 2.0 * S_PER_DAY / intlen
+        return components, rates
 
     @reify
     def _data(self):
@@ -183,7 +194,7 @@ class Segment(BaseSegment):
         coefficients = rollaxis(coefficients, 1)
         coefficients = rollaxis(coefficients, 2)
         coefficients = coefficients[::-1]
-        return init, intlen, coefficients
+        return float(init), float(intlen), coefficients
 
     def load_array(self):
         init, intlen, coefficients = self._data
@@ -205,9 +216,46 @@ class Segment(BaseSegment):
         point, this generator lets you get them as two separate steps.
 
         """
-        scalar = not getattr(tdb, 'shape', 0) and not getattr(tdb2, 'shape', 0)
+        scalar, index, s = self._locate(tdb, tdb2)
+        init, intlen, coefficients = self._data
+        evaluate = _scalar if scalar else _blockwise
+
+        # Chebyshev polynomial, keeping the terms of its recurrence so
+        # the velocity step can reuse them.  Callers who only want the
+        # position should call compute(), which keeps no terms at all.
+
+        terms = evaluate(_chebyshev_terms, coefficients, index, s)
+        yield terms[0]
+
+        # Chebyshev differentiation, which needs only those terms.
+
         if scalar:
-            tdb = array((tdb,))
+            rates = array([_chebyshev_derivative(w, s)
+                           for w in terms[1:].T.tolist()])
+        else:
+            rates = _chebyshev_derivative(terms[1:], s)
+        rates *= 2.0 * S_PER_DAY / intlen
+        yield rates
+
+    def _locate(self, tdb, tdb2):
+        """Return the interval index and Chebyshev time for each date.
+
+        Returns a tuple ``(scalar, index, s)`` where ``scalar`` says
+        whether the dates were plain numbers instead of arrays, and
+        ``s`` runs from -1 to +1 across each interval.  For a plain
+        number, ``index`` and ``s`` are plain numbers as well.
+
+        """
+        scalar = isinstance(tdb, float) and isinstance(tdb2, float)
+        if not scalar:
+            tdb = asarray(tdb)
+            tdb2 = asarray(tdb2)
+            scalar = not tdb.ndim and not tdb2.ndim
+        if scalar:
+            # Python floats do arithmetic several times faster than
+            # NumPy scalars, which matters in the Chebyshev loop.
+            tdb = float(tdb)
+            tdb2 = float(tdb2)
 
         init, intlen, coefficients = self._data
         coefficient_count, component_count, n = coefficients.shape
@@ -215,12 +263,32 @@ class Segment(BaseSegment):
         # Keeping fractions strictly separate from whole numbers
         # maintains the highest possible precision.
 
-        index1, offset1 = divmod((tdb - T0) * S_PER_DAY - init, intlen)
-        index2, offset2 = divmod(tdb2 * S_PER_DAY, intlen)
-        index3, offset = divmod(offset1 + offset2, intlen)
-        index = (index1 + index2 + index3).astype(int)
+        seconds = tdb - T0
+        seconds *= S_PER_DAY
+        seconds -= init
+        index, offset = divmod(seconds, intlen)
+
+        # Only a nonzero tdb2 can carry the offset into another interval.
+
+        if getattr(tdb2, 'shape', 0) or tdb2:
+            index2, offset2 = divmod(tdb2 * S_PER_DAY, intlen)
+            index3, offset = divmod(offset + offset2, intlen)
+            index = index + index2
+            index += index3
 
-        if (index < 0).any() or (index > n).any():
+        if scalar:
+            if 0 <= index < n:
+                return scalar, int(index), offset * (2.0 / intlen) - 1.0
+            # Let the array logic below handle the last instant of the
+            # segment, and raise the error for dates outside of it.
+            index = array((index,))
+            offset = array((offset,))
+
+        index = index.astype(int)
+        low = index.min() if index.size else 0
+        high = index.max() if index.size else 0
+
+        if low < 0 or high > n:
             raise OutOfRangeError(
                 'segment only covers dates %d-%02d-%02d through %d-%02d-%02d'
                 % (compute_calendar_date(self.start_jd + 0.5) +
@@ -228,51 +296,162 @@ class Segment(BaseSegment):
                 out_of_range_times=(index < 0) | (index > n),
             )
 
-        omegas = (index == n)
-        index[omegas] -= 1
-        offset[omegas] += intlen
-
-        coefficients = coefficients[:,:,index]
+        # Dates at the very end of the segment belong to its last
+        # interval; the maximum above says whether there are any.
 
-        # Chebyshev polynomial.
+        if high == n:
+            omegas = (index == n)
+            index[omegas] -= 1
+            offset[omegas] += intlen
 
-        s = 2.0 * offset / intlen - 1.0
-        s2 = 2.0 * s
-
-        w0 = w1 = 0.0
-        wlist = []
+        s = offset
+        s *= 2.0 / intlen
+        s -= 1.0
+        if scalar:
+            return scalar, int(index[0]), s[0]
+        return scalar, index, s
 
-        for coefficient in coefficients[:-1]:
-            w2 = w1
-            w1 = w0
-            w0 = coefficient + (s2 * w1 - w2)
-            wlist.append(w1)
+def _blockwise(function, coefficients, index, s):
+    """Apply a Chebyshev `function` to successive blocks of dates.
 
-        components = coefficients[-1] + (s * w0 - w1)
+    Gathering and evaluating the coefficients for only `BLOCK_SIZE`
+    dates at a time, instead of for every date at once, keeps the
+    intermediate arrays small enough to stay in the processor cache.
 
-        if scalar:
-            components = components[:,0]
+    If the dates instead arrive in long runs that share an interval,
+    as when a caller asks for a dense grid of dates, then each run is
+    evaluated against a single set of coefficients that NumPy can
+    broadcast, which skips the gather entirely.
 
-        yield components
+    Dates in arrays of more than one dimension are evaluated all at once.
 
-        # Chebyshev differentiation.
+    """
+    if index.ndim > 1:
+        return function(coefficients[:,:,index], s)
+    n = len(index)
+    if n >= RUN_LENGTH:
+        starts = flatnonzero(index[1:] != index[:-1]) + 1
+        if (len(starts) + 1) * RUN_LENGTH <= n:
+            bounds = [0] + starts.tolist() + [n]
+            return _assemble(function, s, (
+                (i, j, coefficients[:,:,index[i]:index[i]+1])
+                for i, j in zip(bounds[:-1], bounds[1:])
+            ))
+    if n <= BLOCK_SIZE:
+        return function(coefficients[:,:,index], s)
+    return _assemble(function, s, (
+        (i, i + BLOCK_SIZE, coefficients[:,:,index[i:i+BLOCK_SIZE]])
+        for i in range(0, n, BLOCK_SIZE)
+    ))
+
+def _scalar(function, coefficients, index, s):
+    """Apply a Chebyshev `function` to a single date `s`.
+
+    For one date, NumPy's per-operation overhead would dwarf the
+    arithmetic itself, so each component's series is instead summed
+    as a plain list of Python floats.
 
-        dw0 = dw1 = 0.0
+    """
+    series = coefficients[:,:,index].T.tolist()
+    return array([function(c, s) for c in series]).T
 
-        for coefficient, w1 in zip(coefficients[:-1], wlist):
-            dw2 = dw1
-            dw1 = dw0
-            dw0 = 2.0 * w1 + dw1 * s2 - dw2
+def _assemble(function, s, blocks):
+    """Fill a single result array by applying `function` to `blocks`.
 
-        rates = w0 + s * dw0 - dw1
-        rates /= intlen
-        rates *= 2.0
-        rates *= S_PER_DAY
+    Each block is an ``(i, j, coefficients)`` tuple for dates ``i:j``.
+    Writing each block's result straight into place avoids building a
+    list of partial results that then all need to be copied again.
 
-        if scalar:
-            rates = rates[:,0]
+    """
+    result = None
+    for i, j, coefficients in blocks:
+        value = function(coefficients, s[i:j])
+        if result is None:
+            shape = (len(value),) + value[0].shape[:-1] + (len(s),)
+            result = empty(shape)
+        result[..., i:j] = value
+    return result
+
+def _chebyshev(coefficients, s):
+    """Sum the Chebyshev series `coefficients` at each time `s`."""
+    s2 = 2.0 * s
+    w0 = w1 = 0.0 * coefficients[0]
+
+    # Updating each fresh product in place, instead of writing out the
+    # whole sum, saves allocating a temporary array at every step.
+    for coefficient in coefficients[:-1]:
+        w2 = w1
+        w1 = w0
+        w0 = s2 * w1
+        w0 -= w2
+        w0 += coefficient
+
+    components = s * w0
+    components -= w1
+    components += coefficients[-1]
+    return components
+
+def _chebyshev_terms(coefficients, s):
+    """Sum the series `coefficients`, keeping the terms for differentiation.
+
+    Returns a list of the sum followed by each successive ``w0`` term
+    of the recurrence, which are all that _chebyshev_derivative() needs.
 
-        yield rates
+    """
+    s2 = 2.0 * s
+    w0 = w1 = 0.0 * coefficients[0]
+    terms = []
+
+    for coefficient in coefficients[:-1]:
+        w2 = w1
+        w1 = w0
+        w0 = s2 * w1
+        w0 -= w2
+        w0 += coefficient
+        terms.append(w0)
+
+    components = s * w0
+    components -= w1
+    components += coefficients[-1]
+    return [components] + terms
+
+def _chebyshev_derivative(terms, s):
+    """Differentiate a series from the `terms` of its Clenshaw sum."""
+    s2 = 2.0 * s
+    w0 = dw0 = dw1 = 0.0
+
+    for w in terms:
+        dw2 = dw1
+        dw1 = dw0
+        dw0 = dw1 * s2 + 2.0 * w0 - dw2
+        w0 = w
+
+    return w0 + s * dw0 - dw1
+
+def _chebyshev_and_derivative(coefficients, s):
+    """Sum and differentiate the series `coefficients` at each time `s`."""
+    s2 = 2.0 * s
+    w0 = w1 = dw0 = dw1 = 0.0 * coefficients[0]
+
+    for coefficient in coefficients[:-1]:
+        w2 = w1
+        w1 = w0
+        w0 = s2 * w1
+        w0 -= w2
+        w0 += coefficient
+        dw2 = dw1
+        dw1 = dw0
+        dw0 = dw1 * s2
+        dw0 += 2.0 * w1
+        dw0 -= dw2
+
+    components = s * w0
+    components -= w1
+    components += coefficients[-1]
+    rates = s * dw0
+    rates += w0
+    rates -= dw1
+    return components, rates
 
 class Type9Segment(BaseSegment):
     """Lagrange Interpolation - Unequal Time Steps"""
@@ -298,12 +477,7 @@ class Type9Segment(BaseSegment):
     def _data(self):
         """Cached arrays that are ready for interpolation."""
         coefficients, epochs = self.map_arrays()
-
-        # Make iteration faster by pre-creating tuples of separate arrays.
-        positions = tuple(coefficients[:3])
-        and_velocities = tuple(coefficients)
-        epochs = jd(epochs)
-        return positions, and_velocities, epochs
+        return coefficients, jd(epochs)
 
     def compute(self, tdb, tdb2=0.0):
         """Interpolate [x y z] at time `tdb` plus `tdb2`.
@@ -311,8 +485,8 @@ class Type9Segment(BaseSegment):
         A standard JPL Type 9 ephemerides will return kilometers.
 
         """
-        positions, and_velocities, epochs = self._data
-        return array([interp(tdb, epochs, c) for c in positions])
+        coefficients, epochs = self._data
+        return _interpolate(coefficients[:3], epochs, tdb)
 
     def compute_and_differentiate(self, tdb, tdb2=0.0):
         """Interpolate [x y z dx dy dz] at time `tdb` plus `tdb2`.
@@ -321,8 +495,23 @@ class Type9Segment(BaseSegment):
         kilometers per second.
 
         """
-        positions, and_velocities, epochs = self._data
-        return array([interp(tdb, epochs, c) for c in and_velocities])
+        coefficients, epochs = self._data
+        return _interpolate(coefficients, epochs, tdb)
+
+def _interpolate(values, epochs, tdb):
+    """Linearly interpolate each row of `values` at each date `tdb`.
+
+    Calling interp() once per row would search `epochs` for every date
+    all over again, so the search is instead done once for all rows.
+    Like interp(), the first and last values are held constant for
+    dates outside of `epochs`; weighting both ends, instead of adding
+    a fraction of their difference, returns them exactly.
+
+    """
+    i = searchsorted(epochs, tdb, 'right').clip(1, len(epochs) - 1)
+    e0 = epochs[i - 1]
+    fraction = ((tdb - e0) / (epochs[i] - e0)).clip(0.0, 1.0)
+    return values[:,i - 1] * (1.0 - fraction) + values[:,i] * fraction
 
 def titlecase(name):
     """Title-case target `name` if it looks safe to do so."""
@@ -11,6 +11,7 @@ smaller and more feature-oriented suite can be run with::
 import gc
 import mmap
 import numpy as np
+import os
 import sys
 import tempfile
 import warnings
@@ -21,12 +22,17 @@ from jplephem import Ephemeris, commandline
 from jplephem.exceptions import OutOfRangeError
 from jplephem.daf import DAF, FTPSTR, NAIF_DAF
 from jplephem.pck import PCK
-from jplephem.spk import SPK
+from jplephem import spk as spk_module
+from jplephem.spk import BLOCK_SIZE, SPK, _interpolate
 from struct import Struct
 try:
     from unittest import SkipTest, TestCase
 except ImportError:
     from unittest2 import SkipTest, TestCase
+try:
+    from unittest.mock import patch
+except ImportError:
+    from mock import patch
 
 epsilon_m = 0.01
 target_names = {
@@ -297,7 +303,7 @@ class _CommonTests(object):
         x, y, z = self.position('earthmoon', tdb, tdb2)
         for component in x, y, z:
             size = component[0]
-            relative_jitter = np.diff(np.diff(x)) / size
+            relative_jitter = np.diff(np.diff(component)) / size
             self.assertLess(max(abs(relative_jitter)), 3e-16)
 
     def test_ephemeris_end_date(self):
@@ -371,6 +377,94 @@ class SPKTests(_CommonTests, TestCase):
         initial_epoch, interval_length, coefficients = segment.load_array()
         self.assertEqual(coefficients.shape, (3, 1760, 11))
 
+    def test_runs_of_dates_spanning_several_blocks(self):
+        # A dense grid, whose runs of dates within each 32-day interval
+        # are long enough to be evaluated run by run; its interval
+        # boundaries fall in the middle of blocks rather than between.
+        segment = self.spk[0,4]
+        tdb = np.linspace(2414994.0, 2415112.5, 2 * BLOCK_SIZE + 1)
+        interval = (tdb - segment.start_jd) // 32.0
+        boundaries = np.flatnonzero(np.diff(interval)) + 1
+        self.assertTrue(len(boundaries) >= 3)
+        self.assertTrue((boundaries % BLOCK_SIZE).all())
+        p = segment.compute(tdb)
+        p2, v2 = segment.compute_and_differentiate(tdb)
+        indexes = [0, BLOCK_SIZE - 1, BLOCK_SIZE, 2 * BLOCK_SIZE]
+        for i in boundaries:
+            indexes.extend([i - 1, i])
+        for i in indexes:
+            pi, vi = segment.compute_and_differentiate(tdb[i])
+            np.testing.assert_array_equal(p[:,i], pi)
+            np.testing.assert_array_equal(p2[:,i], pi)
+            np.testing.assert_array_equal(v2[:,i], vi)
+
+    def test_unsorted_dates_spanning_several_blocks(self):
+        # Random dates, which share no runs, so that their coefficients
+        # must be gathered one block at a time.
+        segment = self.spk[0,4]
+        random = np.random.RandomState(2414994)
+        tdb = random.uniform(segment.start_jd, segment.end_jd,
+                             2 * BLOCK_SIZE + 1)
+        p = segment.compute(tdb)
+        p2, v2 = segment.compute_and_differentiate(tdb)
+        for i, t in enumerate(tdb):
+            pi, vi = segment.compute_and_differentiate(t)
+            np.testing.assert_array_equal(p[:,i], pi)
+            np.testing.assert_array_equal(p2[:,i], pi)
+            np.testing.assert_array_equal(v2[:,i], vi)
+
+    def test_scalar_dates_match_array_dates(self):
+        segment = self.spk[0,4]
+        tdb = [2414994.0, 2415112.5, segment.end_jd]
+        p, v = segment.compute_and_differentiate(np.array(tdb))
+        for i, t in enumerate(tdb):
+            pi, vi = segment.compute_and_differentiate(t)
+            self.assertEqual(pi.shape, (3,))
+            np.testing.assert_array_equal(segment.compute(t), p[:,i])
+            np.testing.assert_array_equal(pi, p[:,i])
+            np.testing.assert_array_equal(vi, v[:,i])
+
+    def test_list_of_dates(self):
+        segment = self.spk[0,4]
+        tdb = [2451545.0, 2451546.0]
+        p, v = segment.compute_and_differentiate(np.array(tdb))
+        self.assertEqual(segment.compute(tdb).shape, (3, 2))
+        np.testing.assert_array_equal(segment.compute(tdb), p)
+        np.testing.assert_array_equal(
+            segment.compute_and_differentiate(tdb), (p, v))
+
+    def test_two_dimensional_dates(self):
+        segment = self.spk[0,4]
+        tdb = np.linspace(2414994.0, 2415112.5, 2 * BLOCK_SIZE + 2)
+        p, v = segment.compute_and_differentiate(tdb)
+        p2, v2 = segment.compute_and_differentiate(tdb.reshape(-1, 2))
+        self.assertEqual(p2.shape, (3, BLOCK_SIZE + 1, 2))
+        np.testing.assert_array_equal(p2.reshape(3, -1), p)
+        np.testing.assert_array_equal(v2.reshape(3, -1), v)
+
+    def test_generate_does_not_repeat_position_work(self):
+        segment = self.spk[0,4]
+        names = '_chebyshev', '_chebyshev_terms', '_chebyshev_and_derivative'
+        for tdb in 2414994.0, np.array([2414994.0, 2415112.5]):
+            p, v = segment.compute_and_differentiate(tdb)
+            kernels = [patch.object(spk_module, name,
+                                    wraps=getattr(spk_module, name))
+                       for name in names]
+            mocks = [kernel.start() for kernel in kernels]
+            try:
+                steps = segment.generate(tdb, 0.0)
+                np.testing.assert_array_equal(next(steps), p)
+                calls = [mock.call_count for mock in mocks]
+                self.assertTrue(sum(calls))
+
+                # The velocity step should reuse the terms of the position
+                # step, without summing the series a second time.
+                np.testing.assert_array_equal(next(steps), v)
+                self.assertEqual([mock.call_count for mock in mocks], calls)
+            finally:
+                for kernel in kernels:
+                    kernel.stop()
+
     def test_out_of_range_dates(self):
         segment = self.spk[0,4]
         tdb = np.array([-1e3, 0, +1e5]) + 2414990.0
@@ -414,6 +508,17 @@ class LegacyTests(_CommonTests, TestCase):
         self.check0(pv[:3,0], pv[3:,0])
         self.check1(pv[:3,1], pv[3:,1])
 
+    def test_legacy_bundle_methods(self):
+        bundle = self.eph.compute_bundle('earthmoon', 2414994.0)
+        self.check0(self.eph.position_from_bundle(bundle),
+                    self.eph.velocity_from_bundle(bundle))
+        tdb = np.array([2414994.0, 2415112.5])
+        bundle = self.eph.compute_bundle('earthmoon', tdb)
+        position = self.eph.position_from_bundle(bundle)
+        velocity = self.eph.velocity_from_bundle(bundle)
+        self.check0(position[:,0], velocity[:,0])
+        self.check1(position[:,1], velocity[:,1])
+
     def test_ephemeris_end_date(self):
         x, y, z = self.position('earthmoon', self.jomega)
         self.assertAlmostEqual(x, -94189805.73967789, delta=epsilon_m)
@@ -429,6 +534,93 @@ class PCKTests(TestCase):
             segment.compute(0.0, 0.0)
         p.close()
 
+    def test_angles_and_rates(self):
+        p = PCK.open('moon_pa_de421_1900-2050.bpc')
+        self.addCleanup(p.close)
+        segment = p.segments[0]
+        angles = [-0.05414833836383814, 0.4248559866580378, 2564.258274163668]
+        rates = [-1.3507945123512752e-09, 5.237649526495941e-10,
+                 2.6631915569536524e-06]
+
+        a, r = segment.compute(2451545.0, 0.0)
+        np.testing.assert_allclose(a, angles, rtol=1e-15, atol=0)
+        np.testing.assert_allclose(r, rates, rtol=1e-15, atol=0)
+        np.testing.assert_array_equal(
+            segment.compute(2451545.0, 0.0, derivative=False), a)
+
+        tdb = np.linspace(2433282.5, 2469807.5, 2 * BLOCK_SIZE + 1)
+        tdb[BLOCK_SIZE] = 2451545.0
+        a, r = segment.compute(tdb, 0.0)
+        np.testing.assert_array_equal(
+            segment.compute(tdb, 0.0, derivative=False), a)
+        np.testing.assert_allclose(a[:,BLOCK_SIZE], angles, rtol=1e-15, atol=0)
+        np.testing.assert_allclose(r[:,BLOCK_SIZE], rates, rtol=1e-15, atol=0)
+        for i in 0, BLOCK_SIZE - 1, BLOCK_SIZE, 2 * BLOCK_SIZE:
+            ai, ri = segment.compute(tdb[i], 0.0)
+            np.testing.assert_array_equal(ai, a[:,i])
+            np.testing.assert_array_equal(ri, r[:,i])
+            np.testing.assert_array_equal(
+                segment.compute(tdb[i], 0.0, derivative=False), a[:,i])
+
+class Type9Tests(TestCase):
+    def test_interpolation_matches_numpy(self):
+        epochs = np.array([0.0, 1.0, 3.0, 4.0])
+        values = np.array([[1.0, 2.0, 6.0, 4.0], [0.0, -1.0, 1.0, 5.0]])
+        tdb = np.array([-1.0, 0.0, 0.5, 1.0, 2.5, 4.0, 9.0])
+        expected = [np.interp(tdb, epochs, row) for row in values]
+        np.testing.assert_allclose(_interpolate(values, epochs, tdb),
+                                   expected, rtol=0, atol=1e-15)
+        np.testing.assert_array_equal(_interpolate(values, epochs, 1.0),
+                                      [2.0, -1.0])
+
+    def type9_segment(self, seconds, states):
+        integer = Struct('<I').pack
+        daf = DAF(BytesIO(b''.join([
+            # Record 1 - File Record, of an SPK with no arrays yet
+            b'DAF/SPK ',
+            integer(2), # ND
+            integer(6), # NI
+            b'Internal Name'.ljust(60, b' '), # LOCIFN
+            integer(3), # FWARD
+            integer(3), # BWARD
+            integer(1024 * 4 // 8 + 1), # FREE
+            b'LTL-IEEE', # LOCFMT
+            b'\0' * 603, # PRENUL
+            FTPSTR,
+            b'\0' * 297, # PSTNUL
+
+            # Record 2
+            b'Comment Record'.ljust(1024, b'\0'),
+
+            # Record 3 - Summary Record
+            b'\0' * 1024,
+
+            # Record 4 - Name Record
+            b' ' * 1024,
+        ])))
+        array = np.concatenate([np.ravel(states), seconds,
+                                [1.0, len(seconds)]])
+        values = (seconds[0], seconds[-1], 401, 4, 1, 9)
+        daf.add_array(b'Type 9', values, array)
+        return SPK(daf)[4,401]
+
+    def test_segment_returns_exact_states_at_and_beyond_its_ends(self):
+        states = np.array([
+            [0.1, 0.2, 0.3, 0.01, 0.02, 0.03],
+            [1e8, -3e7, 7e6, 1.7, -2.9, 0.3],
+            [0.7, 0.3, -0.9, -0.7, 0.03, 0.11],
+        ])
+        segment = self.type9_segment([0.0, 86400.0, 259200.0], states)
+        tdb = np.array([2451544.0, 2451545.0, 2451546.0,
+                        2451548.0, 2451549.0])
+        expected = states[[0, 0, 1, 2, 2]].T
+        np.testing.assert_array_equal(segment.compute(tdb), expected[:3])
+        np.testing.assert_array_equal(
+            segment.compute_and_differentiate(tdb), expected)
+        for i, t in enumerate(tdb):
+            np.testing.assert_array_equal(segment.compute(t),
+                                          expected[:3,i])
+
 class NAIF_DAF_Tests(TestCase):
 
     def test_single_position(self):
@@ -489,6 +681,7 @@ File type NAIF/DAF and format BIG-IEEE with 15 segments:
     def test_excerpt_command(self):
         output = commandline.main(['excerpt', '2023/8/23', '2023/8/24',
                                    'de421.bsp', 'de421_excerpt.bsp'])
+        self.addCleanup(os.remove, 'de421_excerpt.bsp')
         self.assertEqual(output, """\
 Date 2023/8/23  = JD 2460179.5
 Date 2023/8/24  = JD 2460180.5
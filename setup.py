@@ -1,14 +1,20 @@
-from distutils.core import setup
+import ast
+import os
+from setuptools import setup
 
-# Fake the presence of numpy so import can succeed.
-import sys
-sys.modules['numpy'] = sys.modules['sys']
-
-import jplephem
-description, long_description = jplephem.__doc__.split('\n', 1)
+# Read the docstring and version without importing the package, whose
+# import of NumPy would fail if NumPy is not yet installed.
+path = os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                    'jplephem', '__init__.py')
+with open(path, 'rb') as f:
+    module = ast.parse(f.read())
+description, long_description = ast.get_docstring(module, False).split('\n', 1)
+version = [ast.literal_eval(node.value) for node in module.body
+           if isinstance(node, ast.Assign)
+           and getattr(node.targets[0], 'id', None) == '__version__'][0]
 
 setup(name = 'jplephem',
-      version = jplephem.__version__,
+      version = version,
       description = description,
       long_description = long_description,
       license = 'MIT',
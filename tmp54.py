@@ -1,34 +1,14 @@
 import numpy as np
 from sys import argv
+from jplephem.calendar import compute_calendar_date
 from jplephem.names import target_names
 from jplephem.spk import SPK, titlecase
 
 _component_names = {1: 'x', 2: 'x,y', 3: 'x,y,z'}
 
-def _compute_calendar_date(jd_integer, julian_before=None):
-    """Convert Julian day ``jd_integer`` into a calendar (year, month, day).
-
-    Uses the proleptic Gregorian calendar unless ``julian_before`` is
-    set to a specific Julian day, in which case the Julian calendar is
-    used for dates older than that.
-
-    """
-    use_gregorian = (julian_before is None) or (jd_integer >= julian_before)
-
-    # See the Explanatory Supplement to the Astronomical Almanac 15.11.
-    f = jd_integer + 1401
-    f += use_gregorian * ((4 * jd_integer + 274277) // 146097 * 3 // 4 - 38)
-    e = 4 * f + 3
-    g = e % 1461 // 4
-    h = 5 * g + 2
-    day = h % 153 // 5 + 1
-    month = (h // 153 + 2) % 12 + 1
-    year = e // 1461 - 4716 + (12 + 2 - month) // 12
-    return year, month, day
-
 def _format_date(jd):
-    year, month, day = _compute_calendar_date(int(jd))
-    return '{:4}-{:02}-{:02}'.format(year, month, day)
+    year, month, day = compute_calendar_date(int(jd))
+    return f'{year:4}-{month:02}-{day:02}'
 
 def print_type2_segment(segment):
     initial_epoch, interval_length, coefficients = segment.load_array()